@@ -1,10 +1,31 @@
 """NetworkX graph building and operations."""
 
+from collections import deque
+from collections.abc import Iterable
 import itertools
 import sqlite3
+import sys
 
 import networkx as nx
 
+from models import Person, Relationship
+
+# Edge types of the union-node layout graph
+SPOUSE_TO_FAMILY = "spouse_to_family"
+FAMILY_TO_CHILD = "family_to_child"
+
+
+def _person_node_attrs(
+    name: str, sex: str | None, birth_date: str | None, death_date: str | None
+) -> dict:
+    """
+    Build the attribute dict of a person node.
+
+    All graph builders go through this so every person node has the same keys in the same order.
+    Note: use 'person_name' instead of 'name' to avoid conflict with pydot.
+    """
+    return {"person_name": name, "sex": sex, "birth_date": birth_date, "death_date": death_date}
+
 
 def build_graph(conn: sqlite3.Connection) -> nx.DiGraph:
     """Build a NetworkX directed graph from the database."""
@@ -12,20 +33,52 @@ def build_graph(conn: sqlite3.Connection) -> nx.DiGraph:
     cursor = conn.cursor()
 
     # Add nodes (persons)
-    # Note: use 'person_name' instead of 'name' to avoid conflict with pydot
+    # Rows are streamed straight from the cursor into NetworkX's bulk insertion methods
     cursor.execute("SELECT id, name, sex, birth_date, death_date FROM person")
-    for row in cursor.fetchall():
-        G.add_node(row[0], person_name=row[1], sex=row[2], birth_date=row[3], death_date=row[4])
+    G.add_nodes_from(
+        (person_id, _person_node_attrs(name, sex, birth_date, death_date))
+        for person_id, name, sex, birth_date, death_date in cursor
+    )
 
     # Add edges (relationships)
+    # sqlite3 returns a fresh str for every row; interning makes all edges share one object per
+    # relationship type
     cursor.execute("SELECT person1_id, person2_id, relationship_type FROM relationship")
-    for row in cursor.fetchall():
-        G.add_edge(row[0], row[1], relationship_type=row[2])
+    G.add_edges_from(
+        (person1_id, person2_id, {"relationship_type": sys.intern(relationship_type)})
+        for person1_id, person2_id, relationship_type in cursor
+    )
 
     return G
 
 
-def get_ego_subgraph(G: nx.DiGraph, center_id: int, radius: int = 2) -> nx.DiGraph:
+def build_graph_from_lists(
+    persons: Iterable[Person], relationships: Iterable[Relationship]
+) -> nx.DiGraph:
+    """
+    Build a NetworkX directed graph directly from parsed persons and relationships.
+
+    Produces the same graph as `build_graph`, without the round trip through SQLite.
+    """
+    G = nx.DiGraph()
+
+    # Add nodes (persons)
+    G.add_nodes_from(
+        (p.id, _person_node_attrs(p.name, p.sex, p.birth_date, p.death_date)) for p in persons
+    )
+
+    # Add edges (relationships)
+    G.add_edges_from(
+        (r.person1_id, r.person2_id, {"relationship_type": r.relationship_type})
+        for r in relationships
+    )
+
+    return G
+
+
+def get_ego_subgraph(
+    G: nx.DiGraph, center_id: int, radius: int = 2, copy: bool = False
+) -> nx.DiGraph:
     """
     Extract a subgraph containing nodes within a given degree of a center node.
 
@@ -33,6 +86,7 @@ def get_ego_subgraph(G: nx.DiGraph, center_id: int, radius: int = 2) -> nx.DiGra
         G: The full graph
         center_id: The person ID to center the subgraph on
         radius: Maximum distance from center (default 2)
+        copy: Return an independent copy instead of a read-only view of G (default False)
 
     Returns:
         A subgraph containing only nodes within `radius` edges of `center_id`
@@ -41,16 +95,18 @@ def get_ego_subgraph(G: nx.DiGraph, center_id: int, radius: int = 2) -> nx.DiGra
         raise ValueError(f"Person ID {center_id} not found in graph")
 
     # Use undirected view for ego graph to capture both directions
-    # (parents, children, spouses all within radius)
-    undirected = G.to_undirected()
-    ego = nx.ego_graph(undirected, center_id, radius=radius)
+    # (parents, children, spouses all within radius). The view avoids copying G, and only the
+    # reachable node set is needed, so skip building the intermediate ego graph as well.
+    undirected = G.to_undirected(as_view=True)
+    ego_nodes = nx.single_source_shortest_path_length(undirected, center_id, cutoff=radius)
 
     # Return the directed subgraph induced by these nodes
-    return G.subgraph(ego.nodes()).copy()
+    subgraph = G.subgraph(ego_nodes)
+    return subgraph.copy() if copy else subgraph
 
 
 def get_lineage_subgraph(
-    G: nx.DiGraph, center_id: int, sex: str = "M", radius: int = 1
+    G: nx.DiGraph, center_id: int, sex: str = "M", radius: int = 1, copy: bool = False
 ) -> nx.DiGraph:
     """
     Extract a subgraph representing the "lineage" of center_id of a particular sex - the union of
@@ -66,6 +122,7 @@ def get_lineage_subgraph(
         center_id: The person ID to center the subgraph on
         sex: The sex of parents to recursively iterate through
         radius: Maximum distance from center (default 1)
+        copy: Return an independent copy instead of a read-only view of G (default False)
 
     Returns:
         A subgraph containing nodes within `radius` edges of the parental lineage `center_id` of
@@ -74,34 +131,17 @@ def get_lineage_subgraph(
     if center_id not in G:
         raise ValueError(f"Person ID {center_id} not found in graph")
 
-    # Use undirected view for ego graph extraction
-    undirected = G.to_undirected()
-
-    # Collect all nodes from ego subgraphs along the lineage
-    all_nodes: set[int] = set()
-
+    # Walk up the chain of parents of the given sex, guarding against cycles in bad data
+    # PARENT_OF edges go from parent → child, so parents are predecessors
+    lineage: list[int] = []
+    seen: set[int] = set()
     current_id = center_id
-    while current_id is not None:
-        # Add ego subgraph nodes for current person
-        # In the special case that radius = 0, ego subgraphs should only contain a node's spouse.
-        if radius == 0:
-            # Add current person and their spouse(s)
-            all_nodes.add(current_id)
-            for neighbor in G.predecessors(current_id):
-                if G.edges[neighbor, current_id].get("relationship_type") == "SPOUSE_OF":
-                    all_nodes.add(neighbor)
-            for neighbor in G.successors(current_id):
-                if G.edges[current_id, neighbor].get("relationship_type") == "SPOUSE_OF":
-                    all_nodes.add(neighbor)
-        else:
-            ego = nx.ego_graph(undirected, current_id, radius=radius)
-            all_nodes.update(ego.nodes())
+    while current_id is not None and current_id not in seen:
+        lineage.append(current_id)
+        seen.add(current_id)
 
-        # Find parent of the given sex
-        # PARENT_OF edges go from parent → child, so parents are predecessors
         next_parent = None
-        for parent in G.predecessors(current_id):
-            edge_data = G.edges[parent, current_id]
+        for parent, edge_data in G.pred[current_id].items():
             if edge_data.get("relationship_type") == "PARENT_OF":
                 parent_data = G.nodes[parent]
                 if parent_data.get("sex") == sex:
@@ -110,8 +150,35 @@ def get_lineage_subgraph(
 
         current_id = next_parent
 
+    # Collect all nodes from ego subgraphs along the lineage
+    all_nodes: set[int] = set(lineage)
+
+    if radius == 0:
+        # In the special case that radius = 0, ego subgraphs should only contain a node's spouse.
+        for current_id in lineage:
+            for neighbor, edge_data in G.pred[current_id].items():
+                if edge_data.get("relationship_type") == "SPOUSE_OF":
+                    all_nodes.add(neighbor)
+            for neighbor, edge_data in G.succ[current_id].items():
+                if edge_data.get("relationship_type") == "SPOUSE_OF":
+                    all_nodes.add(neighbor)
+    else:
+        # A single breadth-first search seeded with every ancestor in the lineage collects the
+        # union of their ego graphs without re-walking overlapping neighborhoods. Edges are
+        # followed in both directions (parents, children, spouses).
+        queue = deque((node, radius) for node in lineage)
+        while queue:
+            node, depth_left = queue.popleft()
+            if depth_left <= 0:
+                continue
+            for neighbor in itertools.chain(G.predecessors(node), G.successors(node)):
+                if neighbor not in all_nodes:
+                    all_nodes.add(neighbor)
+                    queue.append((neighbor, depth_left - 1))
+
     # Return the directed subgraph induced by these nodes
-    return G.subgraph(all_nodes).copy()
+    subgraph = G.subgraph(all_nodes)
+    return subgraph.copy() if copy else subgraph
 
 
 def build_union_layout_graph(G: nx.DiGraph) -> nx.DiGraph:
@@ -136,41 +203,37 @@ def build_union_layout_graph(G: nx.DiGraph) -> nx.DiGraph:
     for n, data in G.nodes(data=True):
         H.add_node(n, node_type="person", **data)
 
-    # Collect spouse pairs (avoid duplicates by sorting)
+    # Partition edges in a single pass: spouse pairs (avoid duplicates by sorting) and
+    # parents grouped by child
     spouse_pairs: set[tuple] = set()
-    for u, v, edata in G.edges(data=True):
-        if edata.get("relationship_type") == "SPOUSE_OF":
-            a, b = tuple(sorted([u, v], key=str))
-            spouse_pairs.add((a, b))
-
-    # Map spouse pair -> family node id
-    fam_for_pair: dict[tuple, str] = {}
+    parents_by_child: dict[int, list[int]] = {}
+    for u, v, relationship_type in G.edges(data="relationship_type"):
+        if relationship_type == "SPOUSE_OF":
+            spouse_pairs.add(tuple(sorted([u, v], key=str)))
+        elif relationship_type == "PARENT_OF":
+            parents_by_child.setdefault(v, []).append(u)
+
+    # Family nodes get integer ids numbered after the largest person id, so they can never
+    # collide with a person node
+    fam_ids = itertools.count(max(G.nodes, default=0) + 1)
+
+    # Map spouse pair -> family node id, and build lookup: spouse -> set of their partners
+    fam_for_pair: dict[frozenset[int], int] = {}
+    spouses_of: dict[int, set[int]] = {}
     for a, b in spouse_pairs:
-        fam_id = f"FAM_{a}_{b}"
-        fam_for_pair[(a, b)] = fam_id
+        fam_id = next(fam_ids)
+        fam_for_pair[frozenset((a, b))] = fam_id
         # Family node is a small connector point
         H.add_node(fam_id, node_type="family", spouses=(a, b))
         # Connect spouses to family node
-        H.add_edge(a, fam_id, edge_type="spouse_to_family")
-        H.add_edge(b, fam_id, edge_type="spouse_to_family")
+        H.add_edge(a, fam_id, edge_type=SPOUSE_TO_FAMILY)
+        H.add_edge(b, fam_id, edge_type=SPOUSE_TO_FAMILY)
 
-    # Build lookup: spouse -> set of their partners
-    spouses_of: dict[int, set[int]] = {}
-    for a, b in spouse_pairs:
         spouses_of.setdefault(a, set()).add(b)
         spouses_of.setdefault(b, set()).add(a)
 
-    # Collect parent->child edges
-    parent_of_edges = [
-        (u, v)
-        for u, v, edata in G.edges(data=True)
-        if edata.get("relationship_type") == "PARENT_OF"
-    ]
-
-    # Group parents by child
-    parents_by_child: dict[int, list[int]] = {}
-    for parent, child in parent_of_edges:
-        parents_by_child.setdefault(child, []).append(parent)
+    # Map set of parents -> family node id, for parents that are not a spouse pair
+    fam_for_parents: dict[frozenset[int], int] = {}
 
     # For each child, connect them to the appropriate family node
     for child, parents in parents_by_child.items():
@@ -179,23 +242,29 @@ def build_union_layout_graph(G: nx.DiGraph) -> nx.DiGraph:
 
         fam_id = None
 
-        # Try to find a spouse pair among the parents
+        # Try to find a spouse pair among the parents, looking up each parent's partners rather
+        # than testing every combination of parents
         if len(parents) >= 2:
-            for p1, p2 in itertools.combinations(parents, 2):
-                a, b = tuple(sorted([p1, p2], key=str))
-                if (a, b) in fam_for_pair:
-                    fam_id = fam_for_pair[(a, b)]
+            for p1 in parents:
+                partners = spouses_of.get(p1)
+                if not partners:
+                    continue
+                p2 = next((p for p in parents if p != p1 and p in partners), None)
+                if p2 is not None:
+                    fam_id = fam_for_pair[frozenset((p1, p2))]
                     break
 
-        # If no spouse pair found, create a single-parent family node
+        # If no spouse pair found, create a single-parent family node (shared by siblings)
         if fam_id is None:
-            fam_id = f"FAM_{'_'.join(map(str, sorted(parents, key=str)))}"
-            if fam_id not in H:
+            parent_set = frozenset(parents)
+            fam_id = fam_for_parents.get(parent_set)
+            if fam_id is None:
+                fam_id = fam_for_parents[parent_set] = next(fam_ids)
                 H.add_node(fam_id, node_type="family", spouses=tuple(parents))
                 for p in parents:
-                    H.add_edge(p, fam_id, edge_type="spouse_to_family")
+                    H.add_edge(p, fam_id, edge_type=SPOUSE_TO_FAMILY)
 
         # Child hangs from family node
-        H.add_edge(fam_id, child, edge_type="family_to_child")
+        H.add_edge(fam_id, child, edge_type=FAMILY_TO_CHILD)
 
     return H
@@ -4,33 +4,36 @@ Family tree application entry point.
 1) Parse the family tree data in the "seay.ged" file into memory.
 2) Normalize it into `person` (nodes) and `relationship` (edges) tables.
     - Ignore non-standard, Ancestry-specific custom tags.
-3) Store the tables with SQLite.
+3) Optionally store the tables with SQLite.
 4) Use the family tree data to create a networkx graph.
 5) Validate the family tree data for cycles, impossible ages, and date ordering.
 6) Plot the networkx graph.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from database import create_database, store_data
-from graph import build_graph, get_ego_subgraph, get_lineage_subgraph
+from database import write_database
+from graph import build_graph_from_lists, get_ego_subgraph, get_lineage_subgraph
 from parsing import normalize_data, parse_gedcom
 from plotting import plot_graph
 from validation import validate_graph
 
 
-def main():
+def main(store_database: bool = True):
+    """
+    Run the family tree pipeline.
+
+    Args:
+        store_database: Whether to persist the parsed tables to a SQLite database file. The graph
+            is built directly from the parsed data either way.
+    """
     # Paths
     project_root = Path(__file__).parent.parent
     gedcom_path = project_root / "seay.ged"
     db_path = project_root / "family_tree.db"
     plot_path = project_root / "family_tree.png"
 
-    # Delete existing database to ensure fresh start
-    if db_path.exists():
-        db_path.unlink()
-        print(f"Deleted existing database: {db_path}")
-
     print(f"Parsing GEDCOM file: {gedcom_path}")
     reader = parse_gedcom(gedcom_path)
 
@@ -38,12 +41,22 @@ def main():
     persons, relationships = normalize_data(reader)
     print(f"  Found {len(persons)} persons and {len(relationships)} relationships")
 
-    print(f"Storing data in SQLite: {db_path}")
-    conn = create_database(db_path)
-    store_data(conn, persons, relationships)
+    store_future = None
+    if store_database:
+        # Delete existing database to ensure fresh start
+        if db_path.exists():
+            db_path.unlink()
+            print(f"Deleted existing database: {db_path}")
+
+        # sqlite3 releases the GIL while executing statements, so write the database on a
+        # worker thread while the graph is built, validated, and plotted
+        print(f"Storing data in SQLite in the background: {db_path}")
+        executor = ThreadPoolExecutor(max_workers=1)
+        store_future = executor.submit(write_database, db_path, persons, relationships)
+        executor.shutdown(wait=False)
 
     print("Building NetworkX graph...")
-    G = build_graph(conn)
+    G = build_graph_from_lists(persons, relationships)
     print(f"  Graph has {G.number_of_nodes()} nodes and {G.number_of_edges()} edges")
 
     print("Validating graph...")
@@ -80,7 +93,11 @@ def main():
     print(f"Plotting graph to: {plot_path}")
     plot_graph(subgraph, plot_path)
 
-    conn.close()
+    if store_future is not None:
+        # Wait for the database write to finish (re-raising any error from the worker)
+        store_future.result()
+        print(f"Data stored in SQLite: {db_path}")
+
     print("Done!")
 
 
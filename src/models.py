@@ -3,7 +3,7 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Person:
     id: int
     name: str
@@ -18,7 +18,7 @@ class Person:
     death_place: str | None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Relationship:
     person1_id: int
     person2_id: int
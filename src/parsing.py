@@ -1,5 +1,6 @@
 """GEDCOM parsing and date handling utilities."""
 
+import functools
 from pathlib import Path
 import re
 
@@ -35,20 +36,87 @@ MONTH_MAP = {
     "DECEMBER": 12,
 }
 
+# MONTH_MAP extended with the spellings usually found in GEDCOM files (upper, title and lower
+# case, with or without a trailing period), so most month names resolve with a single lookup.
+# Other casings fall back to `MONTH_MAP.get(name.upper())`.
+_MONTH_LOOKUP = {
+    variant: month
+    for name, month in MONTH_MAP.items()
+    for cased in (name, name.title(), name.lower())
+    for variant in (cased, f"{cased}.")
+}
+
+# Translation table deleting every non-digit character (xref ids are plain ASCII), used to pull
+# the numeric part out of an xref id without a regex
+_NON_DIGITS = str.maketrans("", "", "".join(chr(c) for c in range(256) if not "0" <= chr(c) <= "9"))
+
+# Date qualifiers (ABT, ABOUT, BEF, AFT, EST, CAL, AROUND, etc.) - with optional colon
+_QUALIFIER_RE = re.compile(
+    r"^(ABT\.?|ABOUT|BEF\.?|BEFORE|AFT\.?|AFTER|EST\.?|CAL\.?|FROM|TO|BET\.?|AND|CIRCA|CA\.?|"
+    r"AROUND):?\s*",
+    re.IGNORECASE,
+)
+
+# Qualifiers that `_QUALIFIER_RE` removes as a whole word, upper-cased, for a set lookup on the
+# first word of a date. BEFORE and AFTER are left out: the regex matches them as BEF and AFT.
+_QUALIFIERS = frozenset(
+    {
+        "ABT",
+        "ABT.",
+        "ABOUT",
+        "BEF",
+        "BEF.",
+        "AFT",
+        "AFT.",
+        "EST",
+        "EST.",
+        "CAL",
+        "CAL.",
+        "FROM",
+        "TO",
+        "BET",
+        "BET.",
+        "AND",
+        "CIRCA",
+        "CA",
+        "CA.",
+        "AROUND",
+    }
+)
+
+# First letters of the qualifiers; a date starting with any other character has no qualifier
+_QUALIFIER_INITIALS = frozenset("ABCEFTabceft")
+
+# All supported date shapes fused into a single alternation, compiled once. The outer named
+# group of each alternative identifies the shape that matched (via `match.lastgroup`). The
+# shapes are mutually exclusive, so at most one alternative can match a given string.
+_DATE_RE = re.compile(
+    r"(?P<iso>(?P<iso_year>\d{4})-(?P<iso_month>\d{2})-(?P<iso_day>\d{2}))"
+    r"|(?P<dmy>(?P<dmy_day>\d{1,2})\s+(?P<dmy_month>[A-Za-z]+)\.?\s*(?P<dmy_year>\d{4}))"
+    r"|(?P<my>(?P<my_month>[A-Za-z]+)\.?,?\s*(?P<my_year>\d{4}))"
+    r"|(?P<y>(?P<y_year>\d{4}))"
+    r"|(?P<mdy>(?P<mdy_month>\d{1,2})[-/](?P<mdy_day>\d{1,2})[-/](?P<mdy_year>\d{4}))"
+    r"|(?P<mdy_space>(?P<mdys_month>\d{1,2})\s+(?P<mdys_day>\d{1,2})\s+(?P<mdys_year>\d{4}))"
+    r"|(?P<mdy_named>(?P<mdyn_month>[A-Za-z]+)\.?\s*(?P<mdyn_day>\d{1,2}),?\s*"
+    r"(?P<mdyn_year>\d{4}))"
+)
+
 
 def extract_numeric_id(xref_id: str) -> int:
     """Extract numeric part from GEDCOM xref_id like '@I_347421849@' or 'I674624289'."""
     # Remove @ symbols and extract all digits
-    digits = re.sub(r"[^0-9]", "", xref_id)
+    digits = xref_id.translate(_NON_DIGITS)
     if not digits:
         raise ValueError(f"No numeric ID found in: {xref_id}")
     return int(digits)
 
 
+@functools.lru_cache(maxsize=65536)
 def parse_date_string(date_str: str | None) -> str | None:
     """
     Parse a GEDCOM date string into ISO format (YYYY-MM-DD).
-    Returns None if the date cannot be parsed.
+    Returns None if the date cannot be parsed. Results are memoized, since the same date strings
+    recur many times in a typical GEDCOM file.
 
     Handles formats like:
     - "25 NOV 1954"
@@ -79,34 +147,76 @@ def parse_date_string(date_str: str | None) -> str | None:
     if not date_str:
         return None
 
+    # A bare year ("1698") is by far the most common shape, and there is nothing to clean up in
+    # it, so return it before stripping and removing qualifiers
+    if len(date_str) == 4 and date_str.isascii() and date_str.isdigit():
+        return f"{date_str}-01-01"
+
     # Clean up the string
     s = date_str.strip()
     # Remove parentheses
     s = s.strip("()")
     # Remove trailing question marks
     s = s.rstrip("?")
-    # Remove qualifiers (ABT, ABOUT, BEF, AFT, EST, CAL, AROUND, etc.) - with optional colon
-    s = re.sub(
-        r"^(ABT\.?|ABOUT|BEF\.?|BEFORE|AFT\.?|AFTER|EST\.?|CAL\.?|FROM|TO|BET\.?|AND|CIRCA|CA\.?|AROUND):?\s*",
-        "",
-        s,
-        flags=re.IGNORECASE,
-    )
+    # Remove qualifiers (ABT, ABOUT, BEF, AFT, EST, CAL, AROUND, etc.) - with optional colon.
+    # The usual "ABT 1900" form is a set lookup on the first word; the regex is only needed for
+    # other forms such as "About:1746" or "ABOUT1900".
+    if s[:1] in _QUALIFIER_INITIALS:
+        head, sep, rest = s.partition(" ")
+        if sep and head.isascii() and head.upper() in _QUALIFIERS:
+            s = rest
+        else:
+            s = _QUALIFIER_RE.sub("", s)
     s = s.strip()
 
     if not s:
         return None
 
-    year: int | None = None
-    month: int | None = None
-    day: int | None = None
+    # Fast paths for the most common shapes, using plain string checks instead of the regex.
+    # Only ASCII digits qualify; anything unusual falls through to the regex below.
+    # "1698" (year only, after removing parentheses and qualifiers)
+    if len(s) == 4 and s.isascii() and s.isdigit():
+        return f"{s}-01-01"
+
+    # "1839-08-29" or "1746-00-00" (YYYY-MM-DD)
+    if len(s) == 10 and s[4] == "-" and s[7] == "-":
+        digits = s[:4] + s[5:7] + s[8:]
+        if digits.isascii() and digits.isdigit():
+            # Handle 00 month/day as defaults
+            month = int(s[5:7]) or 1
+            day = int(s[8:]) or 1
+            if month <= 12 and day <= 31:
+                return f"{s[:4]}-{month:02d}-{day:02d}"
+            return None
+
+    # "25 NOV 1954" (day month year, single spaces)
+    parts = s.split(" ")
+    if len(parts) == 3:
+        day_str, month_str, year_str = parts
+        month = _MONTH_LOOKUP.get(month_str)
+        if month is None and month_str.isascii():
+            month = MONTH_MAP.get(month_str.upper())
+        digits = day_str + year_str
+        if (
+            month
+            and 1 <= len(day_str) <= 2
+            and len(year_str) == 4
+            and digits.isascii()
+            and digits.isdigit()
+        ):
+            return f"{year_str}-{month:02d}-{int(day_str):02d}"
+
+    match = _DATE_RE.fullmatch(s)
+    if match is None:
+        return None
+
+    shape = match.lastgroup
 
     # Pattern 0: ISO format "1839-08-29" or "1746-00-00" (YYYY-MM-DD)
-    match = re.match(r"^(\d{4})-(\d{2})-(\d{2})$", s)
-    if match:
-        year = int(match.group(1))
-        month = int(match.group(2))
-        day = int(match.group(3))
+    if shape == "iso":
+        year = int(match["iso_year"])
+        month = int(match["iso_month"])
+        day = int(match["iso_day"])
         # Handle 00 month/day as defaults
         if month == 0:
             month = 1
@@ -115,77 +225,49 @@ def parse_date_string(date_str: str | None) -> str | None:
         if 1 <= month <= 12 and 1 <= day <= 31:
             return f"{year:04d}-{month:02d}-{day:02d}"
 
-    # Pattern 1: "25 NOV 1954" or "25 Nov 1954" (day month year)
-    match = re.match(r"^(\d{1,2})\s+([A-Za-z]+)\.?\s*(\d{4})$", s)
-    if match:
-        day = int(match.group(1))
-        month_str = match.group(2).upper().rstrip(".")
-        month = MONTH_MAP.get(month_str)
-        year = int(match.group(3))
+    # Pattern 1: "25 NOV 1954", "02 May1838", "08 March 1893" or "11 Aug. 1968"
+    # (day month year)
+    elif shape == "dmy":
+        day = int(match["dmy_day"])
+        month = _MONTH_LOOKUP.get(match["dmy_month"]) or MONTH_MAP.get(match["dmy_month"].upper())
+        year = int(match["dmy_year"])
         if month:
             return f"{year:04d}-{month:02d}-{day:02d}"
 
     # Pattern 2: "NOV 1954" or "November 1954" or "May, 1837" (month year, optional comma)
-    match = re.match(r"^([A-Za-z]+)\.?,?\s*(\d{4})$", s)
-    if match:
-        month_str = match.group(1).upper().rstrip(".")
-        month = MONTH_MAP.get(month_str)
-        year = int(match.group(2))
+    elif shape == "my":
+        month = _MONTH_LOOKUP.get(match["my_month"]) or MONTH_MAP.get(match["my_month"].upper())
+        year = int(match["my_year"])
         if month:
             return f"{year:04d}-{month:02d}-01"
 
     # Pattern 3: "1698" (year only)
-    match = re.match(r"^(\d{4})$", s)
-    if match:
-        year = int(match.group(1))
+    elif shape == "y":
+        year = int(match["y_year"])
         return f"{year:04d}-01-01"
 
     # Pattern 4: "01-27-1920" or "01/27/1920" (MM-DD-YYYY or MM/DD/YYYY)
-    match = re.match(r"^(\d{1,2})[-/](\d{1,2})[-/](\d{4})$", s)
-    if match:
-        month = int(match.group(1))
-        day = int(match.group(2))
-        year = int(match.group(3))
+    elif shape == "mdy":
+        month = int(match["mdy_month"])
+        day = int(match["mdy_day"])
+        year = int(match["mdy_year"])
         if 1 <= month <= 12 and 1 <= day <= 31:
             return f"{year:04d}-{month:02d}-{day:02d}"
 
     # Pattern 5: "04 05 1911" (MM DD YYYY with spaces)
-    match = re.match(r"^(\d{1,2})\s+(\d{1,2})\s+(\d{4})$", s)
-    if match:
-        month = int(match.group(1))
-        day = int(match.group(2))
-        year = int(match.group(3))
+    elif shape == "mdy_space":
+        month = int(match["mdys_month"])
+        day = int(match["mdys_day"])
+        year = int(match["mdys_year"])
         if 1 <= month <= 12 and 1 <= day <= 31:
             return f"{year:04d}-{month:02d}-{day:02d}"
 
-    # Pattern 6: "02 May1838" (DD MonthYYYY - no space between month and year)
-    match = re.match(r"^(\d{1,2})\s+([A-Za-z]+)(\d{4})$", s)
-    if match:
-        day = int(match.group(1))
-        month_str = match.group(2).upper().rstrip(".")
-        month = MONTH_MAP.get(month_str)
-        year = int(match.group(3))
-        if month:
-            return f"{year:04d}-{month:02d}-{day:02d}"
-
-    # Pattern 7: "08 March 1893" or "11 Aug. 1968" (DD Month YYYY)
-    match = re.match(r"^(\d{1,2})\s+([A-Za-z]+)\.?\s+(\d{4})$", s)
-    if match:
-        day = int(match.group(1))
-        month_str = match.group(2).upper().rstrip(".")
-        month = MONTH_MAP.get(month_str)
-        year = int(match.group(3))
-        if month:
-            return f"{year:04d}-{month:02d}-{day:02d}"
-
-    # Pattern 8: "April 17, 1850" or "SEPT. 17,1910" or "Oct.12,1929"
+    # Pattern 6: "April 17, 1850" or "SEPT. 17,1910" or "Oct.12,1929"
     # (Month DD, YYYY - various spacing)
-    match = re.match(r"^([A-Za-z]+)\.?\s*(\d{1,2}),?\s*(\d{4})$", s)
-    if match:
-        month_str = match.group(1).upper().rstrip(".")
-        month = MONTH_MAP.get(month_str)
-        day = int(match.group(2))
-        year = int(match.group(3))
+    elif shape == "mdy_named":
+        month = _MONTH_LOOKUP.get(match["mdyn_month"]) or MONTH_MAP.get(match["mdyn_month"].upper())
+        day = int(match["mdyn_day"])
+        year = int(match["mdyn_year"])
         if month:
             return f"{year:04d}-{month:02d}-{day:02d}"
 
@@ -197,9 +279,21 @@ def parse_gedcom(filepath: Path) -> GedcomReader:
     return GedcomReader(str(filepath))
 
 
-def extract_name_parts(indi) -> tuple[str, str | None, str | None]:
-    """Extract full name, given name, and surname from an individual record."""
-    name_rec = indi.sub_tag("NAME")
+def index_sub_records(rec) -> dict:
+    """
+    Map each tag to the first direct sub-record of `rec` with that tag.
+
+    Scanning `rec.sub_records` once is cheaper than repeated `sub_tag()` calls, each of which
+    rescans the whole list. Pointers are not dereferenced.
+    """
+    sub_records = {}
+    for sub_rec in rec.sub_records or ():
+        sub_records.setdefault(sub_rec.tag, sub_rec)
+    return sub_records
+
+
+def extract_name_parts(name_rec) -> tuple[str, str | None, str | None]:
+    """Extract full name, given name, and surname from an individual's NAME record."""
     if name_rec is None:
         return ("Unknown", None, None)
 
@@ -226,14 +320,14 @@ def extract_name_parts(indi) -> tuple[str, str | None, str | None]:
     return (full_name, given_name, surname)
 
 
-def extract_event_details(indi, tag: str) -> tuple[str | None, str | None]:
-    """Extract date and place from an event tag (BIRT, DEAT, etc.)."""
-    event = indi.sub_tag(tag)
+def extract_event_details(event) -> tuple[str | None, str | None]:
+    """Extract date and place from an event record (BIRT, DEAT, etc.)."""
     if event is None:
         return (None, None)
 
-    date_rec = event.sub_tag("DATE")
-    place_rec = event.sub_tag("PLAC")
+    event_sub_records = index_sub_records(event)
+    date_rec = event_sub_records.get("DATE")
+    place_rec = event_sub_records.get("PLAC")
 
     # Convert date value to string (ged4py may return DateValue objects)
     date_val = None
@@ -247,12 +341,79 @@ def extract_event_details(indi, tag: str) -> tuple[str | None, str | None]:
     return (date_val, place_val)
 
 
-def extract_sex(indi) -> str | None:
-    """Extract sex from an individual record."""
-    sex_rec = indi.sub_tag("SEX")
+def extract_sex(sex_rec) -> str | None:
+    """Extract sex from an individual's SEX record."""
     return sex_rec.value if sex_rec else None
 
 
+def extract_person(indi) -> Person:
+    """Build a Person from an individual (INDI) record."""
+    indi_id = extract_numeric_id(indi.xref_id)
+    sub_records = index_sub_records(indi)
+    full_name, given_name, surname = extract_name_parts(sub_records.get("NAME"))
+    sex = extract_sex(sub_records.get("SEX"))
+    birth_date_string, birth_place = extract_event_details(sub_records.get("BIRT"))
+    death_date_string, death_place = extract_event_details(sub_records.get("DEAT"))
+
+    # Parse date strings into ISO format
+    birth_date = parse_date_string(birth_date_string)
+    death_date = parse_date_string(death_date_string)
+
+    return Person(
+        id=indi_id,
+        name=full_name,
+        given_name=given_name,
+        surname=surname,
+        sex=sex,
+        birth_date_string=birth_date_string,
+        birth_date=birth_date,
+        birth_place=birth_place,
+        death_date_string=death_date_string,
+        death_date=death_date,
+        death_place=death_place,
+    )
+
+
+def extract_family_members(
+    fam, xref0: dict, person_ids: dict[str, int]
+) -> tuple[int | None, int | None, list[int]]:
+    """
+    Extract the husband, wife, and children IDs from a family (FAM) record.
+
+    HUSB/WIFE/CHIL pointers are read in one scan of the sub-records. The pointer value is
+    already the xref id of the individual, so there is no need to dereference it (which re-reads
+    that individual's record from the file). Like `sub_tag()`, pointers that do not resolve to a
+    record in `xref0` (the reader's xref index) are skipped.
+
+    `person_ids` memoizes xref id -> numeric id. Individuals already read are looked up there;
+    other pointers are converted with `extract_numeric_id` and added to it.
+    """
+    husb_id = None
+    wife_id = None
+    child_ids = []
+    for sub_rec in fam.sub_records or ():
+        tag = sub_rec.tag
+        if tag not in ("HUSB", "WIFE", "CHIL"):
+            continue
+
+        xref_id = sub_rec.value
+        person_id = person_ids.get(xref_id)
+        if person_id is None:
+            if xref_id not in xref0:
+                continue
+            person_id = person_ids[xref_id] = extract_numeric_id(xref_id)
+
+        if tag == "CHIL":
+            child_ids.append(person_id)
+        elif tag == "HUSB":
+            if husb_id is None:
+                husb_id = person_id
+        elif wife_id is None:
+            wife_id = person_id
+
+    return husb_id, wife_id, child_ids
+
+
 def normalize_data(reader: GedcomReader) -> tuple[list[Person], list[Relationship]]:
     """
     Extract persons and relationships from parsed GEDCOM data.
@@ -261,69 +422,28 @@ def normalize_data(reader: GedcomReader) -> tuple[list[Person], list[Relationshi
     persons: list[Person] = []
     relationships: list[Relationship] = []
 
-    # Track family records for relationship extraction
-    families: dict[str, dict] = {}
-
-    # First pass: extract all individuals
-    for rec in reader.records0("INDI"):
-        if rec.xref_id is None:
+    # Single pass over the reader's index of level-0 records, extracting individuals and
+    # family records as they come. Only INDI and FAM records are read and parsed.
+    # Numeric ids of individuals by xref id, so family records reuse the ids computed while
+    # reading the individuals
+    xref0 = reader.xref0
+    person_ids: dict[str, int] = {}
+    for offset, tag in reader.index0:
+        if tag != "INDI" and tag != "FAM":
             continue
 
-        indi_id = extract_numeric_id(rec.xref_id)
-        full_name, given_name, surname = extract_name_parts(rec)
-        sex = extract_sex(rec)
-        birth_date_string, birth_place = extract_event_details(rec, "BIRT")
-        death_date_string, death_place = extract_event_details(rec, "DEAT")
-
-        # Parse date strings into ISO format
-        birth_date = parse_date_string(birth_date_string)
-        death_date = parse_date_string(death_date_string)
-
-        persons.append(
-            Person(
-                id=indi_id,
-                name=full_name,
-                given_name=given_name,
-                surname=surname,
-                sex=sex,
-                birth_date_string=birth_date_string,
-                birth_date=birth_date,
-                birth_place=birth_place,
-                death_date_string=death_date_string,
-                death_date=death_date,
-                death_place=death_place,
-            )
-        )
-
-    # Second pass: extract family records
-    for rec in reader.records0("FAM"):
-        fam_id = rec.xref_id
-
-        if fam_id is None:
+        rec = reader.read_record(offset)
+        if rec is None or rec.xref_id is None:
             continue
 
-        husb = rec.sub_tag("HUSB")
-        wife = rec.sub_tag("WIFE")
-
-        husb_id = extract_numeric_id(husb.xref_id) if husb and husb.xref_id else None
-        wife_id = extract_numeric_id(wife.xref_id) if wife and wife.xref_id else None
-
-        child_ids = []
-        for child in rec.sub_tags("CHIL"):
-            if child.xref_id:
-                child_ids.append(extract_numeric_id(child.xref_id))
-
-        families[fam_id] = {
-            "husb": husb_id,
-            "wife": wife_id,
-            "children": child_ids,
-        }
+        if tag == "INDI":
+            person = extract_person(rec)
+            person_ids[rec.xref_id] = person.id
+            persons.append(person)
+            continue
 
-    # Build relationships from families
-    for fam in families.values():
-        husb_id = fam["husb"]
-        wife_id = fam["wife"]
-        children = fam["children"]
+        # Build relationships from the family record as soon as it is read
+        husb_id, wife_id, child_ids = extract_family_members(rec, xref0, person_ids)
 
         # Spouse relationship
         if husb_id and wife_id:
@@ -336,7 +456,7 @@ def normalize_data(reader: GedcomReader) -> tuple[list[Person], list[Relationshi
             )
 
         # Parent-child relationships
-        for child_id in children:
+        for child_id in child_ids:
             if husb_id:
                 relationships.append(
                     Relationship(
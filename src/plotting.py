@@ -5,7 +5,10 @@ from pathlib import Path
 import networkx as nx
 import pydot
 
-from graph import build_union_layout_graph
+from graph import FAMILY_TO_CHILD, SPOUSE_TO_FAMILY, build_union_layout_graph
+
+# Person node fill color by sex; anyone else is drawn in lightgray
+_SEX_COLOR = {"M": "lightblue", "F": "lightpink"}
 
 
 def plot_graph(G: nx.DiGraph, output_path: Path | None = None):
@@ -32,8 +35,8 @@ def plot_graph(G: nx.DiGraph, output_path: Path | None = None):
     P.set_nodesep("0.4")  # Horizontal spacing between nodes
     P.set_ranksep("0.6")  # Vertical spacing between ranks
 
-    # Track spouse pairs for rank=same subgraphs
-    spouse_pairs: list[tuple] = []
+    # Number of rank=same subgraphs added so far, used to name them
+    couple_count = 0
 
     # Add nodes
     for node, data in H.nodes(data=True):
@@ -50,30 +53,23 @@ def plot_graph(G: nx.DiGraph, output_path: Path | None = None):
                     label="",
                 )
             )
-            # Track spouse pairs for rank alignment
+            # Add a rank=same subgraph to align the spouse pair horizontally
             spouses = data.get("spouses", ())
             if len(spouses) == 2:
-                spouse_pairs.append(spouses)
+                sg = pydot.Subgraph(f"cluster_couple_{couple_count}", rank="same")
+                sg.add_node(pydot.Node(str(spouses[0])))
+                sg.add_node(pydot.Node(str(spouses[1])))
+                P.add_subgraph(sg)
+                couple_count += 1
         else:
-            # Person nodes
-            sex = data.get("sex")
-            person_name = data.get("person_name", "?")
-
-            # Color by sex
-            if sex == "M":
-                fillcolor = "lightblue"
-            elif sex == "F":
-                fillcolor = "lightpink"
-            else:
-                fillcolor = "lightgray"
-
+            # Person nodes, colored by sex
             P.add_node(
                 pydot.Node(
                     str(node),
-                    label=person_name,
+                    label=data.get("person_name", "?"),
                     shape="box",
                     style="rounded,filled",
-                    fillcolor=fillcolor,
+                    fillcolor=_SEX_COLOR.get(data.get("sex"), "lightgray"),
                     fontsize="10",
                 )
             )
@@ -82,7 +78,7 @@ def plot_graph(G: nx.DiGraph, output_path: Path | None = None):
     for u, v, data in H.edges(data=True):
         edge_type = data.get("edge_type", "")
 
-        if edge_type == "spouse_to_family":
+        if edge_type == SPOUSE_TO_FAMILY:
             # Spouse to family node: no arrow, constraint to keep hierarchy
             P.add_edge(
                 pydot.Edge(
@@ -92,7 +88,7 @@ def plot_graph(G: nx.DiGraph, output_path: Path | None = None):
                     color="darkgray",
                 )
             )
-        elif edge_type == "family_to_child":
+        elif edge_type == FAMILY_TO_CHILD:
             # Family node to child: arrow pointing down
             P.add_edge(
                 pydot.Edge(
@@ -102,13 +98,6 @@ def plot_graph(G: nx.DiGraph, output_path: Path | None = None):
                 )
             )
 
-    # Add rank=same subgraphs to align spouse pairs horizontally
-    for i, (a, b) in enumerate(spouse_pairs):
-        sg = pydot.Subgraph(f"cluster_couple_{i}", rank="same")
-        sg.add_node(pydot.Node(str(a)))
-        sg.add_node(pydot.Node(str(b)))
-        P.add_subgraph(sg)
-
     # Render
     if output_path:
         # Determine format from extension
@@ -119,17 +108,15 @@ def plot_graph(G: nx.DiGraph, output_path: Path | None = None):
         P.write(str(output_path), format=ext)
         print(f"Graph saved to {output_path}")
     else:
-        # Save to temporary file and display
-        import tempfile
+        # Render the PNG in memory and display it; no temporary file is written and read back
+        import io
 
         import matplotlib.image as mpimg
         import matplotlib.pyplot as plt
 
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as f:
-            P.write_png(f.name)
-            img = mpimg.imread(f.name)
-            plt.figure(figsize=(20, 16))
-            plt.imshow(img)
-            plt.axis("off")
-            plt.tight_layout()
-            plt.show()
+        img = mpimg.imread(io.BytesIO(P.create_png()), format="png")
+        plt.figure(figsize=(20, 16))
+        plt.imshow(img)
+        plt.axis("off")
+        plt.tight_layout()
+        plt.show()
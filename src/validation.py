@@ -1,5 +1,7 @@
 """Graph validation for family tree data."""
 
+import graphlib
+
 import networkx as nx
 
 
@@ -14,59 +16,75 @@ def validate_graph(G: nx.DiGraph) -> list[str]:
     """
     warnings: list[str] = []
 
-    # Create a subgraph with only PARENT_OF edges for cycle detection
+    # Collect PARENT_OF edges in a single pass; they are reused by both the cycle check and the
+    # parent-child age checks
     parent_edges = [
-        (u, v) for u, v, d in G.edges(data=True) if d.get("relationship_type") == "PARENT_OF"
+        (u, v)
+        for u, v, relationship_type in G.edges(data="relationship_type")
+        if relationship_type == "PARENT_OF"
     ]
-    parent_graph = nx.DiGraph(parent_edges)
 
     # Check for cycles
+    # TopologicalSorter takes a mapping of node -> predecessors (parents) and fails on the first
+    # cycle it finds; the reported cycle repeats its first node at the end
+    parents_of: dict[int, list[int]] = {}
+    for parent, child in parent_edges:
+        parents_of.setdefault(child, []).append(parent)
     try:
-        cycle = nx.find_cycle(parent_graph, orientation="original")
-        cycle_nodes = [edge[0] for edge in cycle]
+        graphlib.TopologicalSorter(parents_of).prepare()
+    except graphlib.CycleError as e:
+        cycle_nodes = e.args[1][:-1]
         warnings.append(f"Cycle detected in parent-child relationships: {cycle_nodes}")
-    except nx.NetworkXNoCycle:
-        pass  # No cycle found, which is good
 
-    # Check for impossible ages (child born before parent)
-    # birth_date is now ISO format (YYYY-MM-DD) which can be compared as strings
-    for parent, child, data in G.edges(data=True):
-        if data.get("relationship_type") != "PARENT_OF":
+    # Gather each person's birth date and birth year in a single pass over the nodes, checking
+    # death before birth along the way. The year is parsed once per person rather than once per
+    # edge, so the parent-child checks only need one dict lookup per endpoint, and node names are
+    # only looked up to format a warning.
+    nodes = G.nodes
+    births: dict[int, tuple[str, int | None]] = {}
+    death_warnings: list[str] = []
+    for node, data in nodes(data=True):
+        birth = data.get("birth_date")
+        if not birth:
             continue
+        # Parse year from ISO format
+        try:
+            births[node] = (birth, int(birth[:4]))
+        except ValueError:
+            births[node] = (birth, None)
 
-        parent_data = G.nodes[parent]
-        child_data = G.nodes[child]
+        death = data.get("death_date")
+        if death and death < birth:
+            death_warnings.append(f"Impossible: {data.get('person_name')} died before being born")
 
-        parent_birth = parent_data.get("birth_date")
-        child_birth = child_data.get("birth_date")
+    # Check for impossible ages (child born before parent)
+    # birth_date is now ISO format (YYYY-MM-DD) which can be compared as strings
+    for parent, child in parent_edges:
+        parent_birth = births.get(parent)
+        child_birth = births.get(child)
 
         if parent_birth and child_birth:
             # Check if child is born before parent (ISO dates can be string-compared)
-            if child_birth < parent_birth:
+            if child_birth[0] < parent_birth[0]:
                 warnings.append(
-                    f"Impossible: {child_data.get('person_name')} born before parent "
-                    f"{parent_data.get('person_name')}"
+                    f"Impossible: {nodes[child].get('person_name')} born before parent "
+                    f"{nodes[parent].get('person_name')}"
                 )
             else:
                 # Check if parent was too young (< 12 years old)
-                # Parse years from ISO format
-                try:
-                    parent_year = int(parent_birth[:4])
-                    child_year = int(child_birth[:4])
-                    if child_year - parent_year < 12:
-                        warnings.append(
-                            f"Suspicious: {parent_data.get('person_name')} was less than 12 years "
-                            f"old when {child_data.get('person_name')} was born"
-                        )
-                except (ValueError, IndexError):
-                    pass
+                parent_year = parent_birth[1]
+                child_year = child_birth[1]
+                if (
+                    parent_year is not None
+                    and child_year is not None
+                    and child_year - parent_year < 12
+                ):
+                    warnings.append(
+                        f"Suspicious: {nodes[parent].get('person_name')} was less than 12 "
+                        f"years old when {nodes[child].get('person_name')} was born"
+                    )
 
     # Check death before birth
-    for _, data in G.nodes(data=True):
-        birth = data.get("birth_date")
-        death = data.get("death_date")
-
-        if birth and death and death < birth:
-            warnings.append(f"Impossible: {data.get('person_name')} died before being born")
+    warnings.extend(death_warnings)
 
     return warnings